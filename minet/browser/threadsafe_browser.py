@@ -2,6 +2,7 @@ from typing import (
     Callable,
     TypeVar,
     Awaitable,
+    List,
     Set,
     Optional,
     Union,
@@ -44,6 +45,12 @@ from minet.types import Redirection
 
 SUPPORTED_BROWSERS = ("chromium", "firefox")
 
+# NOTE: launching a browser is expensive but creating contexts is not, so
+# we keep a small pool of lazily-created contexts that get reused by
+# rotation, rather than funneling every request through a single context
+# sharing one cookie jar & cache
+DEFAULT_CONTEXT_POOL_SIZE = min(os.cpu_count() or 1, 8)
+
 
 BrowserName = Literal["chromium", "firefox"]
 T = TypeVar("T")
@@ -95,6 +102,12 @@ class ThreadsafeBrowser:
         self.browser_name: str = browser
         self.browser: Optional[Browser] = None
         self.default_browser_context: Optional[BrowserContext] = None
+        self.context_pool_size = DEFAULT_CONTEXT_POOL_SIZE
+        self.context_pool: List[Optional["asyncio.Task[BrowserContext]"]] = [
+            None
+        ] * self.context_pool_size
+        self.__context_rotation = 0
+        self.context_init: Optional[Callable[[BrowserContext], Awaitable[None]]] = None
         self.headless = headless
         self.width = width
         self.height = height
@@ -160,10 +173,64 @@ class ThreadsafeBrowser:
                 viewport={"width": self.width, "height": self.height}, locale="en-US"
             )
 
+    # NOTE: this must run on the loop thread, which conveniently makes the
+    # rotation atomic since the loop is single-threaded
+    async def __get_pooled_context(self) -> BrowserContext:
+        # Persistent contexts (needed by extensions) cannot be pooled
+        if self.browser is None:
+            assert self.default_browser_context is not None
+            return self.default_browser_context
+
+        i = self.__context_rotation % self.context_pool_size
+        self.__context_rotation += 1
+
+        # NOTE: the slot must be reserved with a task before any await,
+        # else concurrent requests arriving while a context is still being
+        # created would each create their own, exceeding the pool cap
+        task = self.context_pool[i]
+
+        if task is None:
+            task = asyncio.ensure_future(self.__create_pooled_context())
+            self.context_pool[i] = task
+
+        try:
+            return await task
+        except Exception:
+            # NOTE: we don't want to poison the slot with a failed creation
+            if self.context_pool[i] is task:
+                self.context_pool[i] = None
+            raise
+
+    async def __create_pooled_context(self) -> BrowserContext:
+        assert self.browser is not None
+
+        context = await self.browser.new_context(
+            viewport={"width": self.width, "height": self.height}, locale="en-US"
+        )
+
+        # NOTE: the registered init hook must run on every pooled context,
+        # else the cookies, auth state or permissions it sets would only
+        # ever exist in the default context
+        if self.context_init is not None:
+            await self.context_init(context)
+
+        return context
+
     async def __stop_playwright(self) -> None:
         # NOTE: we need to make sure those were actually launched, in
         # case of a nasty race condition
 
+        for task in self.context_pool:
+            if task is None:
+                continue
+
+            try:
+                context = await task
+            except Exception:
+                continue
+
+            await context.close()
+
         if self.default_browser_context is not None:
             await self.default_browser_context.close()
 
@@ -238,6 +305,38 @@ class ThreadsafeBrowser:
 
         return self.__handle_future(future)
 
+    # NOTE: the hook is registered then applied to the default context and
+    # to every already-created pooled context; contexts created afterwards
+    # run it at creation time, so requests served from the pool behave the
+    # same as ones served from the default context
+    def set_context_init(
+        self, fn: Callable[[BrowserContext], Awaitable[None]]
+    ) -> None:
+        async def task() -> None:
+            self.context_init = fn
+
+            assert self.default_browser_context is not None
+            await fn(self.default_browser_context)
+
+            for pooled_task in self.context_pool:
+                if pooled_task is not None:
+                    await fn(await pooled_task)
+
+        future = asyncio.run_coroutine_threadsafe(task(), self.loop)
+
+        self.__handle_future(future)
+
+    def run_in_pooled_context(
+        self, fn: BrowserContextCallable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        async def task() -> T:
+            context = await self.__get_pooled_context()
+            return await fn(context, *args, **kwargs)
+
+        future = asyncio.run_coroutine_threadsafe(task(), self.loop)
+
+        return self.__handle_future(future)
+
     def run_in_browser_or_default_context(
         self,
         fn: BrowserOrBrowserContextCallable[P, T],
@@ -367,7 +466,7 @@ class ThreadsafeBrowser:
         timeout: Optional[AnyTimeout] = None,
         callback: Optional[Callable[[Page], Awaitable[None]]] = None,
     ) -> Response:
-        return self.run_in_default_context(
+        return self.run_in_pooled_context(
             self.__request,
             url,
             raise_on_statuses=raise_on_statuses,
@@ -1,5 +1,6 @@
 from typing import Union, Callable, Awaitable
 
+import re
 import asyncio
 from tempfile import gettempdir
 from os.path import expanduser, join
@@ -29,36 +30,47 @@ from minet.browser.constants import BROWSERS_PATH
 
 AnyPlaywrightError = Union[PlaywrightError, PlaywrightTimeoutError]
 
+# NOTE: chromium network errors are matched through a single scan of the
+# message rather than one substring search per error code
+NET_ERROR_RE = re.compile(
+    r"net::ERR_("
+    r"NAME_NOT_RESOLVED|"
+    r"ABORTED|"
+    r"CONNECTION_REFUSED|"
+    r"CONNECTION_CLOSED|"
+    r"CERT_AUTHORITY_INVALID|"
+    r"CERT_COMMON_NAME_INVALID|"
+    r"HTTP_RESPONSE_CODE_FAILURE|"
+    r"CONNECTION_TIMED_OUT|"
+    r"SOCKET_NOT_CONNECTED"
+    r")"
+)
+
+NET_ERROR_MAP = {
+    "NAME_NOT_RESOLVED": BrowserNameNotResolvedError,
+    "ABORTED": BrowserConnectionAbortedError,
+    "CONNECTION_REFUSED": BrowserConnectionRefusedError,
+    "CONNECTION_CLOSED": BrowserConnectionClosedError,
+    "CERT_AUTHORITY_INVALID": BrowserSSLError,
+    "CERT_COMMON_NAME_INVALID": BrowserSSLError,
+    "HTTP_RESPONSE_CODE_FAILURE": BrowserHTTPResponseCodeFailureError,
+    "CONNECTION_TIMED_OUT": BrowserConnectionTimeoutError,
+    "SOCKET_NOT_CONNECTED": BrowserSocketError,
+}
 
-def convert_playwright_error(error: AnyPlaywrightError) -> BrowserError:
-    lower_message = error.message.lower()
 
+def convert_playwright_error(error: AnyPlaywrightError) -> BrowserError:
     if isinstance(error, PlaywrightTimeoutError):
         return BrowserTimeoutError()
 
-    if "net::ERR_NAME_NOT_RESOLVED" in error.message:
-        return BrowserNameNotResolvedError()
-
-    if "net::ERR_ABORTED" in error.message:
-        return BrowserConnectionAbortedError()
+    message = error.message
 
-    if "net::ERR_CONNECTION_REFUSED" in error.message:
-        return BrowserConnectionRefusedError()
+    net_error_match = NET_ERROR_RE.search(message)
 
-    if "net::ERR_CONNECTION_CLOSED" in error.message:
-        return BrowserConnectionClosedError()
+    if net_error_match is not None:
+        return NET_ERROR_MAP[net_error_match.group(1)]()
 
-    if (
-        "net::ERR_CERT_AUTHORITY_INVALID" in error.message
-        or "net::ERR_CERT_COMMON_NAME_INVALID" in error.message
-    ):
-        return BrowserSSLError()
-
-    if "net::ERR_HTTP_RESPONSE_CODE_FAILURE" in error.message:
-        return BrowserHTTPResponseCodeFailureError()
-
-    if "net::ERR_CONNECTION_TIMED_OUT" in error.message:
-        return BrowserConnectionTimeoutError()
+    lower_message = message.lower()
 
     if (
         "target page, context or browser has been closed" in lower_message
@@ -67,10 +79,7 @@ def convert_playwright_error(error: AnyPlaywrightError) -> BrowserError:
     ):
         return BrowserContextAlreadyClosedError()
 
-    if "net::ERR_SOCKET_NOT_CONNECTED" in error.message:
-        return BrowserSocketError()
-
-    if "Page.content" in error.message:
+    if "Page.content" in message:
         return BrowserUnableToRetrieveContentError()
 
     return BrowserYetUnimplementedError()
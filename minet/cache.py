@@ -0,0 +1,115 @@
+# =============================================================================
+# Minet Response Cache
+# =============================================================================
+#
+# An opt-in sqlite-backed cache for finalized HTTP responses, so that
+# re-running a command over an overlapping list of urls does not need to
+# hit the network again for urls already fetched.
+#
+from typing import Optional
+
+import sqlite3
+import pickle
+from os import makedirs
+from os.path import join
+from threading import Lock
+from time import time
+
+from minet.web import Response
+
+# NOTE: same rationale as the crawler queue: wal + synchronous=normal
+# spares us one fsync per write while remaining consistent.
+SQL_PRAGMAS = """
+PRAGMA journal_mode=wal;
+PRAGMA synchronous=normal;
+"""
+
+SQL_CREATE = """
+CREATE TABLE IF NOT EXISTS "response" (
+    "url" TEXT PRIMARY KEY,
+    "timestamp" REAL NOT NULL,
+    "pickle" BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+SQL_GET_RESPONSE = """
+SELECT "timestamp", "pickle" FROM "response" WHERE "url" = ?;
+"""
+
+SQL_SET_RESPONSE = """
+INSERT OR REPLACE INTO "response" ("url", "timestamp", "pickle") VALUES (?, ?, ?);
+"""
+
+SQL_DELETE_RESPONSE = """
+DELETE FROM "response" WHERE "url" = ?;
+"""
+
+
+class ResponseCache:
+    """
+    Disk-backed cache keyed by url, storing pickled minet Response
+    objects with an optional time-to-live.
+
+    Note that the cache only ever stores successful outcomes, and that
+    it is safe to share a single instance across the threads of an
+    executor.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.ttl = ttl
+        self.lock = Lock()
+
+        self.connection = sqlite3.connect(
+            join(path, "responses.db"), check_same_thread=False
+        )
+
+        self.connection.executescript(SQL_PRAGMAS)
+
+        with self.connection:
+            self.connection.execute(SQL_CREATE)
+
+    def __len__(self) -> int:
+        with self.lock:
+            cursor = self.connection.execute('SELECT count(*) FROM "response";')
+            return cursor.fetchone()[0]
+
+    def get(self, url: str) -> Optional[Response]:
+        with self.lock:
+            cursor = self.connection.execute(SQL_GET_RESPONSE, (url,))
+            row = cursor.fetchone()
+
+            if row is None:
+                return None
+
+            timestamp, blob = row
+
+            # Expired?
+            if self.ttl is not None and time() - timestamp >= self.ttl:
+                with self.connection:
+                    self.connection.execute(SQL_DELETE_RESPONSE, (url,))
+
+                return None
+
+        return pickle.loads(blob)
+
+    def set(self, url: str, response: Response) -> None:
+        blob = pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self.lock, self.connection:
+            self.connection.execute(SQL_SET_RESPONSE, (url, time(), blob))
+
+    def clear(self) -> None:
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM "response";')
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
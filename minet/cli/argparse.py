@@ -31,6 +31,10 @@ from pytz.exceptions import UnknownTimeZoneError
 from minet.dates import datetime_from_partial_iso_format
 
 from minet.cli.console import MINET_COLORS
+from minet.cli.constants import (
+    DEFAULT_INPUT_BUFFER_BYTES,
+    DEFAULT_OUTPUT_BUFFER_BYTES,
+)
 from minet.cli.exceptions import NotResumableError, InvalidArgumentsError
 from minet.cli.utils import acquire_cross_platform_stdout
 
@@ -391,7 +395,13 @@ class CSVFileType:
         try:
             # As per #254: newline='' is necessary for CSV output on windows to avoid
             # outputting extra lines because of a '\r\r\n' end of line...
-            return open(string, self.mode, encoding="utf-8", newline="")
+            return open(
+                string,
+                self.mode,
+                buffering=DEFAULT_OUTPUT_BUFFER_BYTES,
+                encoding="utf-8",
+                newline="",
+            )
         except OSError as e:
             raise ArgumentTypeError(
                 "can't open '%(filename)s': %(error)s"
@@ -480,7 +490,12 @@ class InputAction(Action):
                 if value.endswith(".gz"):
                     f = gzip.open(value, "rt", encoding="utf-8")
                 else:
-                    f = open(value, "r", encoding="utf-8")
+                    f = open(
+                        value,
+                        "r",
+                        buffering=DEFAULT_INPUT_BUFFER_BYTES,
+                        encoding="utf-8",
+                    )
             except OSError as e:
                 args = {"filename": value, "error": e}
                 message = gettext("can't open '%(filename)s': %(error)s")
@@ -514,7 +529,13 @@ class OutputOpener(object):
 
         # As per #254: newline='' is necessary for CSV output on windows to avoid
         # outputting extra lines because of a '\r\r\n' end of line...
-        return open(self.path, mode, encoding="utf-8", newline="")
+        return open(
+            self.path,
+            mode,
+            buffering=DEFAULT_OUTPUT_BUFFER_BYTES,
+            encoding="utf-8",
+            newline="",
+        )
 
 
 class OutputAction(Action):
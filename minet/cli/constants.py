@@ -7,3 +7,12 @@
 DEFAULT_CONTENT_FOLDER = "downloaded"
 DEFAULT_SCREENSHOT_FOLDER = "screenshots"
 DEFAULT_PREBUFFER_BYTES = 3_000_000  # 3mb
+
+# NOTE: the default buffer size used by `open` is usually the filesystem's
+# block size (often a measly 4kb), which means an unnecessary amount of
+# write syscalls when dumping large CSV files
+DEFAULT_OUTPUT_BUFFER_BYTES = 131_072  # 128kb
+
+# NOTE: large crawl reports are read sequentially start to finish, so a
+# generous read buffer means fewer syscalls and better OS prefetching
+DEFAULT_INPUT_BUFFER_BYTES = 1_048_576  # 1mb
@@ -13,42 +13,48 @@ from minet.exceptions import CookieGrabbingError, UnknownBrowserError
 from minet.cli.exceptions import FatalError
 
 
-# Taken from: https://github.com/python/cpython/blob/3.9/Lib/http/cookiejar.py
+# Adapted from: https://github.com/python/cpython/blob/3.9/Lib/http/cookiejar.py
+# NOTE: lines are accumulated and written in one go rather than paying one
+# write call per cookie
 def write_jar_as_text_mozilla(jar, f, ignore_discard=False, ignore_expires=False):
     now = time.time()
+
+    lines = []
+
     for cookie in jar:
         if not ignore_discard and cookie.discard:
             continue
         if not ignore_expires and cookie.is_expired(now):
             continue
-        if cookie.secure:
-            secure = "TRUE"
-        else:
-            secure = "FALSE"
-        if cookie.domain.startswith("."):
-            initial_dot = "TRUE"
-        else:
-            initial_dot = "FALSE"
-        if cookie.expires is not None:
-            expires = str(cookie.expires)
-        else:
-            expires = ""
-        if cookie.value is None:
+
+        name = cookie.name
+        value = cookie.value
+
+        if value is None:
             # cookies.txt regards 'Set-Cookie: foo' as a cookie
             # with no name, whereas http.cookiejar regards it as a
             # cookie with no value.
-            name = ""
-            value = cookie.name
-        else:
-            name = cookie.name
-            value = cookie.value
-        f.write(
+            name, value = "", name
+
+        domain = cookie.domain
+
+        lines.append(
             "\t".join(
-                [cookie.domain, initial_dot, cookie.path, secure, expires, name, value]
+                (
+                    domain,
+                    "TRUE" if domain.startswith(".") else "FALSE",
+                    cookie.path,
+                    "TRUE" if cookie.secure else "FALSE",
+                    str(cookie.expires) if cookie.expires is not None else "",
+                    name,
+                    value,
+                )
             )
-            + "\n"
         )
 
+    if lines:
+        f.write("\n".join(lines) + "\n")
+
 
 COOKIE_CSV_HEADER = [
     "domain",
@@ -101,8 +107,11 @@ def action(cli_args):
 
                 parsed = SimpleCookie(cookie)
 
-                for morsel in parsed.values():
-                    output_writer.writerow(format_morsel_for_csv(morsel))
+                # NOTE: writerows lets the csv module iterate on its own
+                # rather than reentering it once per row
+                output_writer.writerows(
+                    format_morsel_for_csv(morsel) for morsel in parsed.values()
+                )
             else:
                 print(cookie, file=cli_args.output)
         else:
@@ -114,7 +123,6 @@ def action(cli_args):
         if cli_args.csv:
             output_writer.writerow(COOKIE_CSV_HEADER)
 
-            for cookie in jar:
-                output_writer.writerow(format_cookie_for_csv(cookie))
+            output_writer.writerows(format_cookie_for_csv(cookie) for cookie in jar)
         else:
             write_jar_as_text_mozilla(jar, cli_args.output)
@@ -9,6 +9,7 @@ from typing import Optional, Iterable, List, Iterator
 import os
 import sys
 import stat
+import json
 import yaml
 import platform
 import casanova
@@ -31,6 +32,13 @@ from minet.cli.loading_bar import LoadingBar, StatsItem
 from minet.cli.exceptions import FatalError
 from minet.utils import fuzzy_int, message_flatmap
 
+# NOTE: the C-backed yaml loader is substantially faster and rcfiles are
+# parsed on every single CLI invocation, but libyaml might not be there
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 
 def colored(string, color):
     return "[{color}]{string}[/{color}]".format(string=string, color=color)
@@ -304,7 +312,11 @@ def get_rcfile(rcfile_path=None):
             continue
 
         with open(p, encoding="utf-8") as f:
-            return yaml.safe_load(f)
+            # NOTE: json rcfiles don't need to pay the price of a yaml parse
+            if p.endswith(".json"):
+                return json.load(f)
+
+            return yaml.load(f, Loader=YamlSafeLoader)
 
     return None
 
@@ -369,8 +369,13 @@ class Crawler(Generic[CrawlJobDataTypes, CrawlResultDataTypes]):
 
             self.browser = ThreadsafeBrowser(**browser_kwargs)
 
+            # NOTE: the init hook is registered on the browser so that it
+            # also runs on each pooled context serving the actual requests.
+            # Beware: pooled contexts don't share cookies with one another,
+            # so state acquired while crawling (as opposed to set by the
+            # hook) does not carry over from one request to the next.
             if browser_context_init is not None:
-                self.browser.run_in_default_context(browser_context_init)
+                self.browser.set_context_init(browser_context_init)
 
         # Utilities
         self.file_writer = ThreadSafeFileWriter(writer_root_directory, sqlar=sqlar)
@@ -449,6 +454,9 @@ class Crawler(Generic[CrawlJobDataTypes, CrawlResultDataTypes]):
         # NOTE: the process pool is initialized before the HTTPThreadPoolExecutor
         # so that we don't have potential issues related to urllib3.PoolManager
         # not being fork-safe.
+        # NOTE: per-host connection pools can be sized from the domain
+        # parallelism when it is a plain integer; when it is a callable the
+        # executor falls back to its historical max_workers upper bound
         self.executor = HTTPThreadPoolExecutor(
             max_workers=max_workers,
             insecure=insecure,
@@ -459,6 +467,9 @@ class Crawler(Generic[CrawlJobDataTypes, CrawlResultDataTypes]):
             proxy=proxy,
             retry=retry,
             retryer_kwargs=retryer_kwargs,
+            domain_parallelism=domain_parallelism
+            if isinstance(domain_parallelism, int)
+            else None,
         )
 
         # NOTE: buffer_size=0 is very important to avoid quenouille's optimistic
@@ -683,6 +694,9 @@ class Crawler(Generic[CrawlJobDataTypes, CrawlResultDataTypes]):
                 if base_url is not None:
                     job.url = urljoin(base_url, job.url)
 
+                # NOTE: the job's domain is computed eagerly, exactly once
+                # per job, and kept as its group for the queue's throttling
+                # & parallelism management
                 job.group = get_domain_name(job.url)
 
                 if spider is not None and job.spider is None:
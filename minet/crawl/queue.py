@@ -12,13 +12,14 @@ from typing import (
 
 import sqlite3
 import pickle
+from heapq import heappush, heappop, heapify
 from os import makedirs
 from os.path import join, isfile
 from shutil import rmtree
 from queue import Empty
-from threading import Lock, Condition
+from threading import Lock, Condition, Thread
 from contextlib import contextmanager
-from datetime import datetime
+from time import time
 from random import randint
 from dataclasses import dataclass
 from quenouille.constants import TIMER_EPSILON
@@ -29,15 +30,57 @@ from minet.utils import iterate_over_sqlite_cursor
 AnyThrottle = Union[float, Callable[[CrawlJob], float]]
 AnyParallelism = Union[int, Callable[[CrawlJob], int]]
 
+# An entry of the in-process heap of dequeuable jobs, as
+# ("priority", order, "index", "group"), where order is the row index,
+# negated when the queue is LIFO so that the heap invariant matches
+# the desired dequeue order.
+CrawlerQueueHeapEntry = Tuple[int, int, int, Optional[str]]
 
+
+# NOTE: this is the same epoch timestamp as datetime.now().timestamp()
+# used historically, without allocating a datetime object per call
 def now() -> float:
-    return datetime.now().timestamp()
+    return time()
+
+
+# NOTE: job data is often a plain string (None being kept as a sql NULL),
+# in which case we don't need to pay pickle's price at all. The first byte
+# of the stored blob tags the serialization scheme used for the rest.
+# Untagged blobs may still be found in databases written by older versions
+# of the queue and are plain pickle (which conveniently always starts
+# with b"\x80" for protocol >= 2).
+def serialize_job_data(data) -> bytes:
+    if isinstance(data, str):
+        return b"s" + data.encode("utf-8")
+
+    return b"p" + pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def deserialize_job_data(blob: bytes):
+    tag = blob[:1]
+
+    if tag == b"s":
+        return blob[1:].decode("utf-8")
+
+    if tag == b"p":
+        return pickle.loads(blob[1:])
+
+    return pickle.loads(blob)
 
 
-# NOTE: synchronous=normal is probably alright for our use-case
+# NOTE: synchronous=normal is probably alright for our use-case, since
+# wal mode guarantees consistency even if we lose the last commits on
+# power loss. It spares us one fsync per commit, which dominates the
+# queue's write cost otherwise. We also keep temporary b-trees in memory
+# and give the connection a larger page cache & mmap window because the
+# queue is hammered by small transactions.
 SQL_PRAGMAS = """
 PRAGMA journal_mode=wal;
 PRAGMA synchronous=normal;
+PRAGMA temp_store=memory;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+PRAGMA auto_vacuum=incremental;
 """
 
 # NOTE about status:
@@ -71,12 +114,6 @@ CREATE TABLE "throttle" (
     "timestamp" REAL NOT NULL
 ) WITHOUT ROWID;
 CREATE INDEX "idx_throttle_timestamp" ON "throttle" ("timestamp");
-
-CREATE TABLE "parallelism" (
-    "group" TEXT PRIMARY KEY,
-    "count" INTEGER NOT NULL,
-    "allowed" INTEGER NOT NULL
-) WITHOUT ROWID;
 """
 
 SQL_INSERT_JOB = """
@@ -93,32 +130,43 @@ INSERT INTO "queue" (
 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
 """
 
-# NOTE: we thought about the opportunity of using
-# RIGHT JOIN as further optimization but it cannot work
-# without keeping a reference to all the groups in the "throttle"
-# and "parallelism" table at all time and this is hardly optimal
-# regarding disk space and query time, in spite of indices.
-SQL_GET_JOB = """
+# NOTE: we used to select the next suitable job through a triple-table
+# LEFT JOIN filtering on throttle & parallelism constraints, but this
+# meant paying planner & sort work for each and every dequeue. Group
+# constraints are now tracked in memory and jobs are found through an
+# in-process heap, so we only ever need to fetch a row by primary key.
+SQL_GET_JOB_BY_INDEX = """
 SELECT
-    "queue"."index",
-    "queue"."id",
-    "queue"."url",
-    "queue"."group",
-    "queue"."depth",
-    "queue"."spider",
-    "queue"."priority",
-    "queue"."data",
-    "queue"."parent"
+    "index",
+    "id",
+    "url",
+    "group",
+    "depth",
+    "spider",
+    "priority",
+    "data",
+    "parent"
 FROM "queue"
-LEFT JOIN "throttle" ON "queue"."group" = "throttle"."group"
-LEFT JOIN "parallelism" ON "queue"."group" = "parallelism"."group"
-WHERE (
-   "queue"."status" = 0
-   AND ("throttle"."timestamp" IS NULL OR "throttle"."timestamp" <= ?)
-   AND ("parallelism"."count" IS NULL OR "parallelism"."count" < "parallelism"."allowed")
-)
-ORDER BY "priority" ASC, "index" %s
-LIMIT 1;
+WHERE "index" = ? AND "status" = 0;
+"""
+
+# NOTE: RETURNING is only supported by sqlite >= 3.35, in which case we
+# can claim a job with a single statement instead of a SELECT + UPDATE
+SQLITE_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+SQL_CLAIM_JOB_BY_INDEX = """
+UPDATE "queue" SET "status" = 1
+WHERE "index" = ? AND "status" = 0
+RETURNING
+    "index",
+    "id",
+    "url",
+    "group",
+    "depth",
+    "spider",
+    "priority",
+    "data",
+    "parent";
 """
 
 SQL_DUMP = """
@@ -137,19 +185,6 @@ FROM "queue"
 ORDER BY "index";
 """
 
-# NOTE: we thought about having a single allowance column that would
-# be decremented when worked by threads but it means we need to keep
-# a reference for each group in the "parallelism" table at all time
-# for this to work and this is hardly optimal regarding disk space
-# and query time, in spite of indices.
-SQL_INCREMENT_PARALLELISM = """
-INSERT OR REPLACE INTO "parallelism" ("group", "count", "allowed") VALUES (
-    ?,
-    COALESCE((SELECT ("count" + 1) FROM "parallelism" WHERE "group" = ? LIMIT 1), 1),
-    ?
-)
-"""
-
 SQL_UPDATE_THROTTLE = """
 INSERT OR REPLACE INTO "throttle" ("group", "timestamp") VALUES (?, ?);
 """
@@ -195,6 +230,12 @@ class BrokenCrawlerQueue(Exception):
 # useful in our case to allow for concurrent access to the queue because most
 # of its operations need to update the database somehow. This also means we
 # can rely on a single lock to make multithreaded transactions safe.
+# NOTE: the database remains the source of truth wrt job rows & statuses so
+# we can persist and resume, but the dequeue order and the group constraints
+# (throttle & parallelism) are tracked in memory: a heap of dequeuable jobs,
+# a dict of jobs blocked by their group's constraints and two dicts keeping
+# throttle timestamps & parallelism counts per group. All those are guarded
+# by the transaction lock, same as the database connection.
 class CrawlerQueue:
     # Params
     persistent: bool
@@ -202,10 +243,15 @@ class CrawlerQueue:
     is_lifo: bool
     group_parallelism: AnyParallelism
     throttle: AnyThrottle
+    task_done_buffer_size: int
 
     # State
+    # NOTE: tasks only keeps the job id -> row index mapping, and never
+    # the job objects themselves, so an in-flight job is freed as soon
+    # as the worker returns instead of living until task_done
     tasks: Dict[str, int]
     connection: sqlite3.Connection
+    read_connection: Optional[sqlite3.Connection]
     counter: int
     cleanup_interval: int
     vacuum_interval: int
@@ -214,6 +260,24 @@ class CrawlerQueue:
     transaction_lock: Lock
     broken: bool
 
+    # In-memory dequeue state, guarded by the transaction lock
+    __ready: List[CrawlerQueueHeapEntry]
+    __blocked: Dict[str, List[CrawlerQueueHeapEntry]]
+    __throttled: Dict[str, float]
+    __parallelism: Dict[str, Tuple[int, int]]
+
+    # Write-behind buffer of row indices finished by task_done, also
+    # guarded by the transaction lock
+    __pending_done: List[int]
+
+    # Maintenance thread state, guarded by its own condition so workers
+    # only ever pay a flag flip & notify for vacuum work
+    __maintenance_thread: Optional[Thread]
+    __maintenance_waiter: Condition
+    __maintenance_busy: bool
+    __pending_vacuum: bool
+    __closing: bool
+
     def __init__(
         self,
         path: Optional[str] = None,
@@ -225,6 +289,7 @@ class CrawlerQueue:
         throttle: AnyThrottle = 0,
         cleanup_interval: int = 1000,
         vacuum_interval: int = 10_000,
+        task_done_buffer_size: int = 64,
     ):
         self.persistent = True
         self.resuming = False
@@ -263,6 +328,7 @@ class CrawlerQueue:
 
         self.cleanup_interval = cleanup_interval
         self.vacuum_interval = vacuum_interval
+        self.task_done_buffer_size = task_done_buffer_size
         self.counter = 0
         self.current_task_done_count = 0
 
@@ -271,7 +337,24 @@ class CrawlerQueue:
         self.transaction_lock = Lock()
         self.broken = False
 
-        self.connection = sqlite3.connect(full_path, check_same_thread=False)
+        self.__ready = []
+        self.__blocked = {}
+        self.__throttled = {}
+        self.__parallelism = {}
+        self.__pending_done = []
+
+        self.__maintenance_thread = None
+        self.__maintenance_waiter = Condition()
+        self.__maintenance_busy = False
+        self.__pending_vacuum = False
+        self.__closing = False
+
+        # NOTE: we bump the statement cache size so that the hot statements
+        # (dequeue select, status updates, throttle upserts etc.) never get
+        # reparsed by sqlite once the queue is warm.
+        self.connection = sqlite3.connect(
+            full_path, check_same_thread=False, cached_statements=256
+        )
 
         # NOTE: it's seems it is safer and common practice to
         # reexecute pragmas each time because they might not
@@ -279,6 +362,19 @@ class CrawlerQueue:
         self.connection.executescript(SQL_PRAGMAS)
         self.connection.commit()
 
+        # NOTE: under wal mode, a reader does not block the writer and is
+        # guaranteed to see a consistent snapshot, so read-only methods can
+        # use a dedicated connection and never contend on the transaction
+        # lock. Memory queues rely on a shared cache with table-level locks
+        # instead of an actual wal, so they keep going through the lock.
+        self.read_connection = None
+
+        if self.persistent:
+            self.read_connection = sqlite3.connect(
+                full_path, check_same_thread=False, cached_statements=256
+            )
+            self.read_connection.execute("PRAGMA query_only=1;")
+
         if inspect:
             return
 
@@ -297,7 +393,9 @@ class CrawlerQueue:
                 cursor.execute('UPDATE "queue" SET "status" = 0 WHERE "status" = 1;')
 
                 # We can safely drop parallelism info as it is bound to runtime
-                cursor.execute('DELETE FROM "parallelism";')
+                # NOTE: the table only remains in databases created by earlier
+                # versions of the queue, since this info now lives in memory
+                cursor.execute('DROP TABLE IF EXISTS "parallelism";')
 
                 # Cleanup throttle a bit
                 cursor.execute('DELETE FROM "throttle" WHERE "timestamp" < ?', (now(),))
@@ -305,6 +403,76 @@ class CrawlerQueue:
                 cursor.connection.commit()
                 cursor.execute("VACUUM;")
 
+                # We rebuild our in-memory dequeue state
+                cursor.execute(
+                    'SELECT "priority", "index", "group" FROM "queue" WHERE "status" = 0;'
+                )
+
+                for row in iterate_over_sqlite_cursor(cursor):
+                    self.__ready.append(
+                        (row[0], row[1] if not lifo else -row[1], row[1], row[2])
+                    )
+
+                heapify(self.__ready)
+
+                cursor.execute('SELECT "group", "timestamp" FROM "throttle";')
+
+                for row in iterate_over_sqlite_cursor(cursor):
+                    self.__throttled[row[0]] = row[1]
+
+        # NOTE: vacuum passes are heavy writes and would block a crawler
+        # worker for their whole duration if run by task_done, so they are
+        # delegated to a dedicated maintenance thread instead. Cleanup, on
+        # the other hand, stays synchronous: it changes the logical state
+        # of the database and a queue dropped without close() must not
+        # leave a dangling thread deleting rows under a resumed successor.
+        self.__maintenance_thread = Thread(
+            name="Thread-crawler-queue-maintenance-%i" % id(self),
+            target=self.__maintenance_worker,
+            daemon=True,
+        )
+        self.__maintenance_thread.start()
+
+    def __maintenance_worker(self) -> None:
+        while True:
+            with self.__maintenance_waiter:
+                while not (self.__pending_vacuum or self.__closing):
+                    self.__maintenance_waiter.wait()
+
+                should_vacuum = self.__pending_vacuum
+                closing = self.__closing
+
+                self.__pending_vacuum = False
+                self.__maintenance_busy = True
+
+            # NOTE: a failing maintenance pass (locked database, full disk
+            # etc.) must not leave the busy flag up, else every waiter of
+            # the barrier below would block forever; we mark the queue as
+            # broken instead, same as #.unblock, so that blocked getters
+            # surface the problem
+            try:
+                if should_vacuum:
+                    with self.transaction() as cursor:
+                        self.__vacuum_and_analyze(cursor)
+            except Exception:
+                with self.waiter:
+                    self.broken = True
+                    self.waiter.notify_all()
+            finally:
+                with self.__maintenance_waiter:
+                    self.__maintenance_busy = False
+                    self.__maintenance_waiter.notify_all()
+
+            if closing:
+                return
+
+    # NOTE: methods that need an accurate view of the database (e.g. dump)
+    # can use this barrier to let in-flight maintenance work settle first
+    def __wait_for_maintenance(self) -> None:
+        with self.__maintenance_waiter:
+            while self.__pending_vacuum or self.__maintenance_busy:
+                self.__maintenance_waiter.wait()
+
     @contextmanager
     def transaction(self):
         cursor = None
@@ -316,9 +484,24 @@ class CrawlerQueue:
             if cursor is not None:
                 cursor.close()
 
+    @contextmanager
+    def read_transaction(self):
+        if self.read_connection is None:
+            with self.transaction() as cursor:
+                yield cursor
+            return
+
+        cursor = None
+        try:
+            cursor = self.read_connection.cursor()
+            yield cursor
+        finally:
+            if cursor is not None:
+                cursor.close()
+
     def explain_query_plan(self, sql: str) -> str:
         if sql == "get":
-            sql = SQL_GET_JOB % ("ASC" if not self.is_lifo else "DESC")
+            sql = SQL_GET_JOB_BY_INDEX
 
         sql = sql.replace("?", "1")
 
@@ -332,46 +515,81 @@ class CrawlerQueue:
         return cursor.fetchone()[0]
 
     def qsize(self) -> int:
-        with self.transaction() as cursor:
+        with self.read_transaction() as cursor:
             return self.__count(cursor)
 
     def __len__(self) -> int:
         return self.qsize()
 
     def put_many(self, jobs: Iterable[CrawlJob]) -> int:
+        order_sign = -1 if self.is_lifo else 1
+
         with self.transaction() as cursor:
-            rows = []
 
-            for job in jobs:
-                rows.append(
-                    (
-                        self.counter,
+            def rows():
+                # NOTE: hot attributes are bound to locals so the inner
+                # loop only pays C-level lookups per job
+                ready = self.__ready
+
+                for index, job in enumerate(jobs, start=self.counter):
+                    # NOTE: pushing as we stream the rows is safe because
+                    # the heap is guarded by the transaction lock and because
+                    # the get path double-checks rows still exist with status=0
+                    heappush(
+                        ready,
+                        (job.priority, order_sign * index, index, job.group),
+                    )
+
+                    yield (
+                        index,
                         job.id,
                         job.url,
                         job.group,
                         job.depth,
                         job.spider,
                         job.priority,
-                        pickle.dumps(job.data) if job.data is not None else None,
+                        serialize_job_data(job.data) if job.data is not None else None,
                         job.parent,
                     )
-                )
-                self.counter += 1
 
-            # NOTE: executemany prepares the statement for us
-            cursor.executemany(SQL_INSERT_JOB, rows)
+            # NOTE: executemany prepares the statement for us and is able to
+            # consume our generator lazily, so rows are streamed to sqlite
+            # without materializing them in a list first
+            cursor.executemany(SQL_INSERT_JOB, rows())
             count = cursor.rowcount
+            self.counter += count
 
-        # NOTE: we notify the waiter because adding jobs to the queue means
-        # there might be one we can do right now
-        with self.waiter:
-            self.waiter.notify()
+        # NOTE: we notify waiters because adding jobs to the queue means
+        # there might be some we can do right now. Waking one waiter per
+        # added job (python caps this to the number of threads actually
+        # waiting) avoids both the stampede of notify_all and the lost
+        # wakeups of a single notify when many jobs land at once.
+        if count > 0:
+            with self.waiter:
+                self.waiter.notify(count)
 
         return count
 
     def put(self, job: CrawlJob) -> None:
         self.put_many((job,))
 
+    # NOTE: this must be called with the transaction lock held
+    def __readmit_blocked_groups(self, current_time: float) -> None:
+        if not self.__blocked:
+            return
+
+        for group in list(self.__blocked.keys()):
+            if self.__throttled.get(group, 0.0) > current_time:
+                continue
+
+            parallelism = self.__parallelism.get(group)
+
+            if parallelism is not None and parallelism[0] >= parallelism[1]:
+                continue
+
+            for entry in self.__blocked.pop(group):
+                heappush(self.__ready, entry)
+
     # NOTE: we will need to cheat a little bit to work with quenouille here.
     # This method will actually block but raise Empty if the queue is drained.
     # We will also need to handle throttling and group parallelism
@@ -405,15 +623,33 @@ class CrawlerQueue:
                     raise BrokenCrawlerQueue
 
             with self.transaction() as cursor:
-                cursor.execute(
-                    SQL_GET_JOB % ("ASC" if not self.is_lifo else "DESC"),
-                    (now(),),
-                )
-                row = cursor.fetchone()
+                current_time = now()
 
-                if row is None:
+                self.__readmit_blocked_groups(current_time)
+
+                entry = None
+
+                while self.__ready:
+                    candidate = heappop(self.__ready)
+                    group = candidate[3]
+
+                    if group is not None:
+                        if self.__throttled.get(group, 0.0) > current_time:
+                            self.__blocked.setdefault(group, []).append(candidate)
+                            continue
+
+                        parallelism = self.__parallelism.get(group)
+
+                        if parallelism is not None and parallelism[0] >= parallelism[1]:
+                            self.__blocked.setdefault(group, []).append(candidate)
+                            continue
+
+                    entry = candidate
+                    break
+
+                if entry is None:
                     # Queue really is drained
-                    if self.__count(cursor) == 0:
+                    if not self.__blocked:
                         raise Empty
 
                     # We may need to wait for a suitable job
@@ -421,23 +657,38 @@ class CrawlerQueue:
                     # open wrt parallelism or enough time wrt throttling
                     need_to_wait = True
 
-                    cursor.execute('SELECT min("timestamp") FROM "throttle" LIMIT 1;')
-                    throttle_row = cursor.fetchone()
-
-                    if throttle_row is not None and throttle_row[0] is not None:
+                    if self.__throttled:
                         need_to_wait_for_at_least = (
-                            max(0, throttle_row[0] - now()) + TIMER_EPSILON
+                            max(0, min(self.__throttled.values()) - current_time)
+                            + TIMER_EPSILON
+                        )
+
+                    continue
+
+                if SQLITE_SUPPORTS_RETURNING:
+                    cursor.execute(SQL_CLAIM_JOB_BY_INDEX, (entry[2],))
+                    row = cursor.fetchone()
+                else:
+                    cursor.execute(SQL_GET_JOB_BY_INDEX, (entry[2],))
+                    row = cursor.fetchone()
+
+                    if row is not None:
+                        # NOTE: sqlite does not always support LIMIT on UPDATE
+                        cursor.execute(
+                            'UPDATE "queue" SET "status" = 1 WHERE "index" = ?;',
+                            (row[0],),
                         )
 
+                # NOTE: the heap may reference a row that does not exist
+                # anymore, e.g. if an insert transaction was rolled back
+                if row is None:
                     continue
 
                 index = row[0]
 
-                # NOTE: sqlite does not always support LIMIT on UPDATE
-                cursor.execute(
-                    'UPDATE "queue" SET "status" = 1 WHERE "index" = ?;',
-                    (index,),
-                )
+                # NOTE: most jobs carry no data at all, so we only hit the
+                # deserialization routine for an actually non-empty blob
+                data = row[7]
 
                 job = CrawlJob(
                     row[2],
@@ -446,7 +697,7 @@ class CrawlerQueue:
                     depth=row[4],
                     spider=row[5],
                     priority=row[6],
-                    data=pickle.loads(row[7]) if row[7] is not None else None,
+                    data=deserialize_job_data(data) if data else None,
                     parent=row[8],
                 )
 
@@ -456,10 +707,10 @@ class CrawlerQueue:
                     if callable(allowed):
                         allowed = allowed(job)
 
-                    cursor.execute(
-                        SQL_INCREMENT_PARALLELISM,
-                        (job.group, job.group, allowed),
-                    )
+                    parallelism = self.__parallelism.get(job.group)
+                    count = 0 if parallelism is None else parallelism[0]
+
+                    self.__parallelism[job.group] = (count + 1, allowed)
 
                 self.tasks[job.id] = index
 
@@ -477,23 +728,23 @@ class CrawlerQueue:
             self.waiter.notify_all()
 
     def worked_groups(self) -> Dict[str, Tuple[int, int]]:
-        g = {}
-
-        with self.transaction() as cursor:
-            cursor.execute(
-                'SELECT "group", "count", "allowed" FROM "parallelism" WHERE "count" > 0;'
-            )
-
-            for row in iterate_over_sqlite_cursor(cursor):
-                g[row[0]] = (row[1], row[2])
-
-        return g
+        with self.transaction_lock:
+            return dict(self.__parallelism)
 
     def dump(self) -> Iterator[CrawlerQueueRecord]:
+        # NOTE: in-flight maintenance work and buffered task_done updates
+        # must hit the database for the dump to reflect reality
+        self.__wait_for_maintenance()
+
         with self.transaction() as cursor:
+            self.__flush_done(cursor)
+
+        with self.read_transaction() as cursor:
             cursor.execute(SQL_DUMP)
 
             for row in iterate_over_sqlite_cursor(cursor):
+                data = row[7]
+
                 job = CrawlJob(
                     row[2],
                     id=row[1],
@@ -501,7 +752,7 @@ class CrawlerQueue:
                     depth=row[4],
                     spider=row[5],
                     priority=row[6],
-                    data=pickle.loads(row[7]) if row[7] is not None else None,
+                    data=deserialize_job_data(data) if data else None,
                     parent=row[8],
                 )
 
@@ -516,27 +767,43 @@ class CrawlerQueue:
                 yield CrawlerQueueRecord(index=row[0], status=status, job=job)
 
     def __cleanup(self, cursor: sqlite3.Cursor) -> None:
+        current_time = now()
+
         # NOTE: we make sure to keep the last index given to ensure we can resume safely
         cursor.execute(
             'DELETE FROM "queue" WHERE "status" = 2 AND "index" <> (SELECT max("index") FROM "queue" ORDER BY "index");'
         )
-        cursor.execute('DELETE FROM "parallelism" WHERE "count" < 1;')
-        cursor.execute('DELETE FROM "throttle" WHERE "timestamp" < ?', (now(),))
+        cursor.execute('DELETE FROM "throttle" WHERE "timestamp" < ?', (current_time,))
+
+        for group in list(self.__throttled.keys()):
+            if self.__throttled[group] < current_time:
+                del self.__throttled[group]
 
     def __clear(self, cursor: sqlite3.Cursor) -> None:
         cursor.execute('DELETE FROM "queue";')
-        cursor.execute('DELETE FROM "parallelism";')
         cursor.execute('DELETE FROM "throttle";')
 
+        self.__ready.clear()
+        self.__blocked.clear()
+        self.__throttled.clear()
+        self.__parallelism.clear()
+        self.__pending_done.clear()
+
     def __vacuum_and_analyze(self, cursor: sqlite3.Cursor) -> None:
         cursor.execute("PRAGMA analysis_limit=1000;")
         cursor.execute("PRAGMA optimize;")
         cursor.connection.commit()
-        cursor.execute("VACUUM;")
+
+        # NOTE: auto_vacuum=incremental lets us reclaim some free pages
+        # without rewriting the whole database file, which a full VACUUM
+        # would do, blocking every reader & writer meanwhile. The full
+        # VACUUM is only run when resuming, before any thread contends.
+        cursor.execute("PRAGMA incremental_vacuum(1000);")
         cursor.connection.commit()
 
     def cleanup(self) -> None:
         with self.transaction() as cursor:
+            self.__flush_done(cursor)
             self.__cleanup(cursor)
 
     def clear(self) -> None:
@@ -556,20 +823,28 @@ class CrawlerQueue:
             if job.id not in self.tasks:
                 raise RuntimeError("job is not being worked")
 
-            cursor.execute(
-                'UPDATE "parallelism" SET "count" = "count" - 1 WHERE "group" = ?;',
-                (job.group,),
-            )
-
-            # NOTE: null group is not throttled, the same as `quenouille`
+            # NOTE: null group is not parallelized nor throttled, the
+            # same as `quenouille`
             if job.group is not None:
+                parallelism = self.__parallelism.get(job.group)
+
+                if parallelism is not None:
+                    count = parallelism[0] - 1
+
+                    if count < 1:
+                        del self.__parallelism[job.group]
+                    else:
+                        self.__parallelism[job.group] = (count, parallelism[1])
+
                 throttle = self.throttle
 
                 if callable(throttle):
                     throttle = throttle(job)
 
                 if throttle > 0:
-                    cursor.execute(SQL_UPDATE_THROTTLE, (job.group, now() + throttle))
+                    timestamp = now() + throttle
+                    self.__throttled[job.group] = timestamp
+                    cursor.execute(SQL_UPDATE_THROTTLE, (job.group, timestamp))
 
         # We notify one waiter that parallelism was updated
         with self.waiter:
@@ -582,6 +857,22 @@ class CrawlerQueue:
         finally:
             self.release_group(job)
 
+    # NOTE: this must be called with the transaction lock held
+    def __flush_done(self, cursor: sqlite3.Cursor) -> None:
+        if not self.__pending_done:
+            return
+
+        cursor.executemany(
+            'UPDATE "queue" SET "status" = 2 WHERE "index" = ?;',
+            ((index,) for index in self.__pending_done),
+        )
+        self.__pending_done.clear()
+
+    # NOTE: finished tasks are buffered in memory and flushed by batches
+    # so we don't pay one commit per job. This means a crash may leave
+    # some already-finished jobs with status=1 in the database, but those
+    # are reset to status=0 when resuming and crawled again, which is
+    # consistent with the queue's at-least-once semantics.
     def task_done(self, job: CrawlJob) -> None:
         with self.transaction() as cursor:
             index = self.tasks.pop(job.id, None)
@@ -589,20 +880,68 @@ class CrawlerQueue:
             if index is None:
                 raise RuntimeError("job is not being worked")
 
-            cursor.execute(
-                'UPDATE "queue" SET "status" = 2 WHERE "index" = ?;', (index,)
-            )
-
+            self.__pending_done.append(index)
             self.current_task_done_count += 1
 
-            if self.current_task_done_count % self.cleanup_interval == 0:
+            should_cleanup = self.current_task_done_count % self.cleanup_interval == 0
+            should_vacuum = self.current_task_done_count % self.vacuum_interval == 0
+
+            # NOTE: done statuses are also flushed, synchronously, whenever a
+            # maintenance pass is due: the flush is a cheap indexed update and
+            # leaving it to the maintenance thread would let a queue dropped
+            # without close() resume with stale statuses
+            if (
+                should_cleanup
+                or should_vacuum
+                or len(self.__pending_done) >= self.task_done_buffer_size
+            ):
+                self.__flush_done(cursor)
+
+            # NOTE: cleanup remains synchronous because it mutates the
+            # logical state of the database (see the maintenance thread
+            # NOTE in __init__); it is a bounded indexed delete, cheap
+            # enough to run inline at every cleanup interval
+            if should_cleanup:
                 self.__cleanup(cursor)
 
-            if self.current_task_done_count % self.vacuum_interval == 0:
-                self.__vacuum_and_analyze(cursor)
+        # NOTE: only the vacuum is delegated to the maintenance thread
+        # so workers never foot its bill
+        if should_vacuum:
+            with self.__maintenance_waiter:
+                self.__pending_vacuum = True
+
+                # NOTE: notify_all because the barrier waiters share the
+                # condition with the maintenance worker
+                self.__maintenance_waiter.notify_all()
 
     def close(self) -> None:
+        # We wait for the maintenance thread to finish any pending work
+        # before touching the connection ourselves
+        with self.__maintenance_waiter:
+            self.__closing = True
+            self.__maintenance_waiter.notify_all()
+
+        if self.__maintenance_thread is not None and self.__maintenance_thread.is_alive():
+            self.__maintenance_thread.join()
+
+        # NOTE: this is where buffered task_done updates are synchronously
+        # flushed, and the only place where we truncate the freelist
+        # entirely, since incremental auto_vacuum only reclaims pages
+        # when explicitly asked to
+        try:
+            with self.transaction() as cursor:
+                self.__flush_done(cursor)
+
+            self.connection.execute("PRAGMA incremental_vacuum;")
+            self.connection.commit()
+        except sqlite3.ProgrammingError:
+            # NOTE: the connection was already closed
+            pass
+
         self.connection.close()
 
+        if self.read_connection is not None:
+            self.read_connection.close()
+
     def __del__(self) -> None:
         self.close()
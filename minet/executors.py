@@ -28,13 +28,18 @@ from minet.types import TypedDict, Unpack, NotRequired
 if TYPE_CHECKING:
     from minet.browser.threadsafe_browser import BrowserOrBrowserContext
 
+import socket
 import urllib3
 import threading
 from threading import Event
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor as DNSPrefetchThreadPoolExecutor
 from quenouille import ThreadPoolExecutor
-from ural import get_domain_name, ensure_protocol
+from ural import get_domain_name, get_hostname, ensure_protocol
 from tenacity import RetryCallState
 
+from minet.cache import ResponseCache
 from minet.serialization import serialize_error_as_slug
 from minet.exceptions import CancelledRequestError, HTTPCallbackError
 from minet.web import (
@@ -60,36 +65,38 @@ ItemType = TypeVar("ItemType")
 ResultType = TypeVar("ResultType")
 CallbackResultType = TypeVar("CallbackResultType")
 
+# NOTE: urls given to an executor tend to hit the same hosts over and over,
+# and extracting a domain name means re-parsing the url in pure python each
+# time, so we keep a bounded cache of the extraction
+cached_get_domain_name = lru_cache(maxsize=4096)(get_domain_name)
+
+
+def prefetch_dns(hostname: str) -> None:
+    try:
+        socket.getaddrinfo(hostname, None, proto=socket.IPPROTO_TCP)
+    except OSError:
+        pass
+
 
 class HTTPWorkerPayloadBase(Generic[ItemType]):
-    __slots__ = ("item", "url", "__has_cached_domain", "__domain")
+    __slots__ = ("item", "url", "domain")
 
     item: ItemType
     url: Optional[str]
+    domain: Optional[str]
 
-    __has_cached_domain: bool
-    __domain: Optional[str]
-
+    # NOTE: the domain is computed eagerly because it will always be consulted
+    # at least once by the executor to key the item, and a plain slot attribute
+    # is cheaper to read than a lazy property on this hot path
     def __init__(self, item: ItemType, url: Optional[str]):
         self.item = item
         self.url = url
-        self.__has_cached_domain = False
-        self.__domain = None
-
-    @property
-    def domain(self) -> Optional[str]:
-        if self.__has_cached_domain:
-            return self.__domain
-
-        if self.url is not None:
-            self.__domain = get_domain_name(self.url)
-
-        self.__has_cached_domain = True
-
-        return self.__domain
+        self.domain = cached_get_domain_name(url) if url is not None else None
 
 
 class HTTPWorkerPayload(HTTPWorkerPayloadBase[ItemType]):
+    __slots__ = ()
+
     item: ItemType
     url: str
 
@@ -108,6 +115,7 @@ class ExecutorRequestKwargs(TypedDict, Generic[ItemType]):
     domain_parallelism: NotRequired[int]
     max_redirects: NotRequired[int]
     known_encoding: NotRequired[Optional[str]]
+    response_cache: NotRequired[Optional[ResponseCache]]
 
 
 class ExecutorResolveKwargs(TypedDict, Generic[ItemType]):
@@ -147,24 +155,22 @@ class RequestResult(Generic[ItemType]):
         name = self.__class__.__name__
 
         if not self.url:
-            return "<{name} null!>".format(name=name)
+            return f"<{name} null!>"
 
         if not self.response:
-            return "<{name} url={url!r} pending!>".format(name=name, url=self.url)
+            return f"<{name} url={self.url!r} pending!>"
 
         if self.error:
-            return "<{name} url={url!r} error={error}>".format(
-                name=name, url=self.url, error=self.error.__class__.__name__
-            )
+            return f"<{name} url={self.url!r} error={self.error.__class__.__name__}>"
 
         assert self.response is not None
 
-        return "<{name} url={url!r} status={status!r}>".format(
-            name=name, url=self.url, status=self.response.status
-        )
+        return f"<{name} url={self.url!r} status={self.response.status!r}>"
 
 
 class PassthroughRequestResult(RequestResult[ItemType]):
+    __slots__ = ()
+
     item: ItemType
     url: None
     error: None
@@ -182,6 +188,8 @@ class PassthroughRequestResult(RequestResult[ItemType]):
 
 
 class ErroredRequestResult(RequestResult[ItemType]):
+    __slots__ = ()
+
     item: ItemType
     url: str
     error: Exception
@@ -199,6 +207,8 @@ class ErroredRequestResult(RequestResult[ItemType]):
 
 
 class SuccessfulRequestResult(RequestResult[ItemType]):
+    __slots__ = ()
+
     item: ItemType
     url: str
     error: None
@@ -246,24 +256,22 @@ class ResolveResult(Generic[ItemType]):
         name = self.__class__.__name__
 
         if not self.url:
-            return "<{name} null!>".format(name=name)
+            return f"<{name} null!>"
 
         if self.error:
-            return "<{name} url={url!r} error={error}>".format(
-                name=name, url=self.url, error=self.error.__class__.__name__
-            )
+            return f"<{name} url={self.url!r} error={self.error.__class__.__name__}>"
 
         assert self.stack is not None
 
-        return "<{name} url={url!r} status={status!r} redirects={redirects!r}>".format(
-            name=name,
-            url=self.url,
-            status=self.stack[-1].status,
-            redirects=len(self.stack),
+        return (
+            f"<{name} url={self.url!r} status={self.stack[-1].status!r} "
+            f"redirects={len(self.stack)!r}>"
         )
 
 
 class PassthroughResolveResult(ResolveResult[ItemType]):
+    __slots__ = ()
+
     item: ItemType
     url: None
     error: None
@@ -281,6 +289,8 @@ class PassthroughResolveResult(ResolveResult[ItemType]):
 
 
 class ErroredResolveResult(ResolveResult[ItemType]):
+    __slots__ = ()
+
     item: ItemType
     url: str
     error: Exception
@@ -298,6 +308,8 @@ class ErroredResolveResult(ResolveResult[ItemType]):
 
 
 class SuccessfulResolveResult(ResolveResult[ItemType]):
+    __slots__ = ()
+
     item: ItemType
     url: str
     error: None
@@ -327,25 +339,67 @@ def key_by_domain_name(payload: HTTPWorkerPayloadBase) -> Optional[str]:
     return payload.domain
 
 
-def payloads_iter(
+def urls_payloads_iter(
     iterable: Iterable[ItemType],
-    key: Optional[Callable[[ItemType], Optional[str]]] = None,
     passthrough: bool = False,
 ) -> Iterator[HTTPWorkerPayloadBase[ItemType]]:
+    Payload = HTTPWorkerPayloadBase
+
+    for url in iterable:
+        if not url:
+            if not passthrough:
+                raise TypeError("item has no url: {!r}".format(url))
+
+            yield Payload(item=url, url=None)
+            continue
+
+        # Url cleanup, with a fast path for the common case of an url
+        # already starting with a suitable protocol, in which case
+        # ensure_protocol would be a noop anyway
+        if url.startswith(("http://", "https://")):  # type: ignore
+            cleaned_url = url.strip()  # type: ignore
+        else:
+            cleaned_url = ensure_protocol(url.strip())  # type: ignore
+
+        yield Payload(item=url, url=cleaned_url)
+
+
+def keyed_payloads_iter(
+    iterable: Iterable[ItemType],
+    key: Callable[[ItemType], Optional[str]],
+    passthrough: bool = False,
+) -> Iterator[HTTPWorkerPayloadBase[ItemType]]:
+    Payload = HTTPWorkerPayloadBase
+
     for item in iterable:
-        url = item if key is None else key(item)
+        url = key(item)
 
         if not url:
             if not passthrough:
                 raise TypeError("item has no url: {!r}".format(item))
 
-            yield HTTPWorkerPayloadBase(item=item, url=None)
+            yield Payload(item=item, url=None)
             continue
 
-        # Url cleanup
-        url = ensure_protocol(url.strip())  # type: ignore
+        if url.startswith(("http://", "https://")):
+            url = url.strip()
+        else:
+            url = ensure_protocol(url.strip())
 
-        yield HTTPWorkerPayloadBase(item=item, url=url)
+        yield Payload(item=item, url=url)
+
+
+# NOTE: the loop is specialized once per call on whether a key is
+# required, so items don't pay for the branch
+def payloads_iter(
+    iterable: Iterable[ItemType],
+    key: Optional[Callable[[ItemType], Optional[str]]] = None,
+    passthrough: bool = False,
+) -> Iterator[HTTPWorkerPayloadBase[ItemType]]:
+    if key is None:
+        return urls_payloads_iter(iterable, passthrough=passthrough)
+
+    return keyed_payloads_iter(iterable, key, passthrough=passthrough)
 
 
 class HTTPWorker(Generic[ItemType, CallbackResultType]):
@@ -367,6 +421,7 @@ class HTTPWorker(Generic[ItemType, CallbackResultType]):
         canonicalize: bool = False,
         known_encoding: Optional[str] = None,
         raise_on_statuses: Optional[Container[int]] = None,
+        response_cache: Optional[ResponseCache] = None,
         callback: Optional[
             Union[
                 Callable[[ItemType, str, Response], CallbackResultType],
@@ -378,6 +433,7 @@ class HTTPWorker(Generic[ItemType, CallbackResultType]):
         self.local_context = local_context
         self.get_args = get_args
         self.callback = callback
+        self.response_cache = response_cache
 
         self.resolving = resolving
         self.fn = request if not resolving else resolve
@@ -430,49 +486,71 @@ class HTTPWorker(Generic[ItemType, CallbackResultType]):
         if url is None:
             return self.PassthroughResult(item), None  # type: ignore
 
-        kwargs = self.default_kwargs.copy()
+        # NOTE: default kwargs are only copied when a get_args callback
+        # may add to them, else the shared dict is given as-is since the
+        # call only ever splats it
+        kwargs = self.default_kwargs
 
-        if self.cancel_event.is_set():
+        # NOTE: attributes probed more than once per call are bound to
+        # locals a single time here
+        cancelled = self.cancel_event.is_set
+        get_args = self.get_args
+        callback = self.callback
+        fn = self.fn
+        response_cache = self.response_cache
+
+        if cancelled():
             return
 
-        if self.get_args is not None:
+        if get_args is not None:
             # NOTE: given callback must be threadsafe
-            kwargs.update(self.get_args(cast(HTTPWorkerPayload, payload)))
+            kwargs = kwargs.copy()
+            kwargs.update(get_args(cast(HTTPWorkerPayload, payload)))
 
-        if self.cancel_event.is_set():
+        if cancelled():
             return
 
-        try:
-            retryer = getattr(self.local_context, "retryer", None)
+        retryer = getattr(self.local_context, "retryer", None)
 
-            if retryer is not None:
-                output = retryer(self.fn, url, **kwargs)
-            else:
-                output = self.fn(url, **kwargs)
+        output = None
 
-        except CancelledRequestError:
-            return
+        if response_cache is not None:
+            output = response_cache.get(url)
 
-        except EXPECTED_WEB_ERRORS as error:
-            return self.ErroredResult(item, url, error), None
+        if output is None:
+            try:
+                if retryer is not None:
+                    output = retryer(fn, url, **kwargs)
+                else:
+                    output = fn(url, **kwargs)
 
-        else:
-            callback_result = None
-
-            if self.callback is not None:
-                if self.cancel_event.is_set():
-                    return
-
-                try:
-                    if retryer is not None:
-                        callback_result = retryer(self.callback, item, url, output)
-                    else:
-                        callback_result = self.callback(item, url, output)  # type: ignore
-                except Exception as reason:
-                    return (
-                        self.ErroredResult(item, url, HTTPCallbackError(reason)),
-                        None,
-                    )
+            except CancelledRequestError:
+                return
+
+            except EXPECTED_WEB_ERRORS as error:
+                return self.ErroredResult(item, url, error), None
+
+            if response_cache is not None:
+                response_cache.set(url, output)
+
+        callback_result = None
+
+        # NOTE: the callback also runs for cached outputs, since its side
+        # effects (writing files, etc.) are expected per item, not per fetch
+        if callback is not None:
+            if cancelled():
+                return
+
+            try:
+                if retryer is not None:
+                    callback_result = retryer(callback, item, url, output)
+                else:
+                    callback_result = callback(item, url, output)  # type: ignore
+            except Exception as reason:
+                return (
+                    self.ErroredResult(item, url, HTTPCallbackError(reason)),
+                    None,
+                )
 
         return self.SuccessfulResult(item, url, output), callback_result  # type: ignore
 
@@ -489,11 +567,27 @@ class HTTPThreadPoolExecutor(ThreadPoolExecutor):
         proxy: Optional[str] = None,
         retry: bool = False,
         retryer_kwargs: Optional[Dict[str, Any]] = None,
+        pool_manager: Optional[urllib3.PoolManager] = None,
+        domain_parallelism: Optional[int] = None,
         **kwargs,
     ):
         self.cancel_event = Event()
         self.local_context = threading.local()
         self.retry_on_statuses = None
+        self.domain_parallelism = (
+            domain_parallelism
+            if domain_parallelism is not None
+            else DEFAULT_DOMAIN_PARALLELISM
+        )
+
+        # NOTE: the first request to each new host pays a synchronous
+        # getaddrinfo, so hostnames are resolved ahead of time by a couple
+        # of dedicated threads to warm the OS resolver cache while earlier
+        # requests are still in flight
+        self.dns_prefetch_executor = DNSPrefetchThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="minet_dns_prefetch"
+        )
+        self.prefetched_hostnames: set = set()
 
         if retry:
 
@@ -525,26 +619,82 @@ class HTTPThreadPoolExecutor(ThreadPoolExecutor):
             **kwargs,
         )
 
-        # NOTE: 0 workers means a synchronous pool in quenouille,
-        # so we reserve at least one connection for the pool.
-        self.pool_manager = create_pool_manager(
-            parallelism=max(1, self.max_workers),
-            num_pools=max(64, self.max_workers),
-            insecure=insecure,
-            timeout=timeout,
-            spoof_tls_ciphers=spoof_tls_ciphers,
-            proxy=proxy,
-        )
+        # NOTE: one can inject an external pool manager, e.g. to share
+        # keep-alive connections across consecutive executors, in which
+        # case the executor will not clear it on shutdown
+        self.owns_pool_manager = pool_manager is None
+
+        if pool_manager is not None:
+            self.pool_manager = pool_manager
+        else:
+            # NOTE: urllib3's maxsize is a per-host setting gating keep-alive
+            # reuse, and the scheduler never runs more than domain_parallelism
+            # concurrent requests on a same host, so when an explicit domain
+            # parallelism is given we size per-host pools from it instead of
+            # wasting sockets on max_workers connections per host. Without
+            # one, per-call values remain free to vary (request/resolve can
+            # still be given a larger domain_parallelism), so we keep the
+            # historical max_workers upper bound.
+            # NOTE: 0 workers means a synchronous pool in quenouille,
+            # so we reserve at least one connection for the pool.
+            self.pool_manager = create_pool_manager(
+                parallelism=max(
+                    1,
+                    domain_parallelism
+                    if domain_parallelism is not None
+                    else self.max_workers,
+                ),
+                num_pools=max(64, self.max_workers),
+                insecure=insecure,
+                timeout=timeout,
+                spoof_tls_ciphers=spoof_tls_ciphers,
+                proxy=proxy,
+            )
 
     def cancel(self) -> None:
         self.cancel_event.set()
 
     def shutdown(self, wait=True) -> None:
         self.cancel()
-        if hasattr(self, "pool_manager"):
+        if hasattr(self, "dns_prefetch_executor"):
+            self.dns_prefetch_executor.shutdown(wait=False)
+        if hasattr(self, "pool_manager") and self.owns_pool_manager:
             self.pool_manager.clear()
         return super().shutdown(wait=wait)
 
+    # NOTE: per-host pools created after this call honor the new maxsize;
+    # existing ones are left untouched on purpose, since clearing them
+    # would drop the very keep-alive connections we want to preserve
+    def __grow_per_host_connections(self, domain_parallelism: int) -> None:
+        if not self.owns_pool_manager:
+            return
+
+        connection_pool_kw = self.pool_manager.connection_pool_kw
+
+        if domain_parallelism > connection_pool_kw.get("maxsize", 1):
+            connection_pool_kw["maxsize"] = domain_parallelism
+
+    def dns_prefetching_iter(
+        self, payloads: Iterator[HTTPWorkerPayloadBase[ItemType]]
+    ) -> Iterator[HTTPWorkerPayloadBase[ItemType]]:
+        submit = self.dns_prefetch_executor.submit
+        seen = self.prefetched_hostnames
+
+        for payload in payloads:
+            if payload.url is not None:
+                hostname = get_hostname(payload.url)
+
+                if hostname is not None and hostname not in seen:
+                    # NOTE: loosely bounded so that a batch visiting a very
+                    # large number of hosts cannot grow the set indefinitely
+                    if len(seen) >= 16384:
+                        seen.clear()
+
+                    seen.add(hostname)
+                    submit(prefetch_dns, hostname)
+
+            yield payload
+
     @overload
     def request(
         self,
@@ -598,9 +748,10 @@ class HTTPThreadPoolExecutor(ThreadPoolExecutor):
         use_pycurl: bool = False,
         compressed: bool = False,
         buffer_size: int = DEFAULT_IMAP_BUFFER_SIZE,
-        domain_parallelism: int = DEFAULT_DOMAIN_PARALLELISM,
+        domain_parallelism: Optional[int] = None,
         max_redirects: int = DEFAULT_FETCH_MAX_REDIRECTS,
         known_encoding: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
         callback: Optional[
             Callable[[ItemType, str, Response], Optional[CallbackResultType]]
         ] = None,
@@ -611,6 +762,11 @@ class HTTPThreadPoolExecutor(ThreadPoolExecutor):
         Iterator[Tuple[AnyRequestResult[ItemType], Optional[CallbackResultType]]],
         Iterator[Tuple[AnyActualRequestResult[ItemType], Optional[CallbackResultType]]],
     ]:
+        if domain_parallelism is None:
+            domain_parallelism = self.domain_parallelism
+
+        self.__grow_per_host_connections(domain_parallelism)
+
         # TODO: validate
         worker = HTTPWorker(
             self.pool_manager,
@@ -622,13 +778,16 @@ class HTTPThreadPoolExecutor(ThreadPoolExecutor):
             compressed=compressed,
             known_encoding=known_encoding,
             raise_on_statuses=self.retry_on_statuses,
+            response_cache=response_cache,
             callback=callback,
         )
 
         method = super().imap if ordered else super().imap_unordered
 
         imap = method(
-            payloads_iter(iterator, key=key, passthrough=passthrough),
+            self.dns_prefetching_iter(
+                payloads_iter(iterator, key=key, passthrough=passthrough)
+            ),
             worker,
             key=key_by_domain_name,
             parallelism=domain_parallelism,
@@ -636,14 +795,13 @@ class HTTPThreadPoolExecutor(ThreadPoolExecutor):
             throttle=throttle,
         )
 
-        for item in imap:
-            if item is None:
-                continue
+        # NOTE: cancelled items come out as None and are dropped here; the
+        # filtering & unwrapping is done by C-level builtins so that results
+        # don't pay for an additional python generator frame
+        if callback is not None:
+            return filter(None, imap)  # type: ignore
 
-            if callback is not None:
-                yield item  # type: ignore
-            else:
-                yield item[0]  # type: ignore
+        return map(itemgetter(0), filter(None, imap))  # type: ignore
 
     @overload
     def resolve(
@@ -700,7 +858,7 @@ class HTTPThreadPoolExecutor(ThreadPoolExecutor):
         throttle: float = DEFAULT_THROTTLE,
         resolve_args: Optional[ArgsCallbackType[ItemType]] = None,
         buffer_size: int = DEFAULT_IMAP_BUFFER_SIZE,
-        domain_parallelism: int = DEFAULT_DOMAIN_PARALLELISM,
+        domain_parallelism: Optional[int] = None,
         max_redirects: int = DEFAULT_RESOLVE_MAX_REDIRECTS,
         follow_refresh_header: bool = True,
         follow_meta_refresh: bool = False,
@@ -717,6 +875,11 @@ class HTTPThreadPoolExecutor(ThreadPoolExecutor):
         Iterator[Tuple[AnyResolveResult[ItemType], Optional[CallbackResultType]]],
         Iterator[Tuple[AnyActualResolveResult[ItemType], Optional[CallbackResultType]]],
     ]:
+        if domain_parallelism is None:
+            domain_parallelism = self.domain_parallelism
+
+        self.__grow_per_host_connections(domain_parallelism)
+
         # TODO: validate
         worker = HTTPWorker(
             self.pool_manager,
@@ -737,7 +900,9 @@ class HTTPThreadPoolExecutor(ThreadPoolExecutor):
         method = super().imap if ordered else super().imap_unordered
 
         imap = method(
-            payloads_iter(iterator, key=key, passthrough=passthrough),
+            self.dns_prefetching_iter(
+                payloads_iter(iterator, key=key, passthrough=passthrough)
+            ),
             worker,
             key=key_by_domain_name,
             parallelism=domain_parallelism,
@@ -745,14 +910,13 @@ class HTTPThreadPoolExecutor(ThreadPoolExecutor):
             throttle=throttle,
         )
 
-        for item in imap:
-            if item is None:
-                continue
+        # NOTE: cancelled items come out as None and are dropped here; the
+        # filtering & unwrapping is done by C-level builtins so that results
+        # don't pay for an additional python generator frame
+        if callback is not None:
+            return filter(None, imap)  # type: ignore
 
-            if callback is not None:
-                yield item  # type: ignore
-            else:
-                yield item[0]  # type: ignore
+        return map(itemgetter(0), filter(None, imap))  # type: ignore
 
 
 class BrowserThreadPoolExecutor(ThreadPoolExecutor):
@@ -92,6 +92,7 @@ class WikimediaRestAPIClient(object):
         with HTTPThreadPoolExecutor(
             max_workers=threads,
             timeout=60,
+            domain_parallelism=threads,
             retry=True,
             retryer_kwargs={
                 "retry_on_timeout": True,
@@ -0,0 +1,45 @@
+from urllib3._collections import HTTPHeaderDict
+
+from minet.cache import ResponseCache
+from minet.web import Response
+
+
+def make_response(url: str, body: bytes) -> Response:
+    return Response(url, None, HTTPHeaderDict(), 200, body)
+
+
+class TestResponseCache:
+    def test_basics(self, tmp_path):
+        with ResponseCache(str(tmp_path)) as cache:
+            assert len(cache) == 0
+            assert cache.get("http://lemonde.fr") is None
+
+            cache.set("http://lemonde.fr", make_response("http://lemonde.fr", b"hello"))
+
+            assert len(cache) == 1
+
+            response = cache.get("http://lemonde.fr")
+
+            assert response is not None
+            assert response.status == 200
+            assert response.body == b"hello"
+
+            cache.clear()
+
+            assert len(cache) == 0
+
+    def test_ttl(self, tmp_path):
+        with ResponseCache(str(tmp_path), ttl=0) as cache:
+            cache.set("http://lemonde.fr", make_response("http://lemonde.fr", b"hello"))
+
+            assert cache.get("http://lemonde.fr") is None
+
+    def test_persistence(self, tmp_path):
+        with ResponseCache(str(tmp_path)) as cache:
+            cache.set("http://lemonde.fr", make_response("http://lemonde.fr", b"hello"))
+
+        with ResponseCache(str(tmp_path)) as cache:
+            response = cache.get("http://lemonde.fr")
+
+            assert response is not None
+            assert response.body == b"hello"
@@ -1,5 +1,8 @@
 from typing import List
 
+import pickle
+import sqlite3
+from os.path import join
 from pytest import raises
 from queue import Empty
 
@@ -181,6 +184,68 @@ class TestCrawlerQueue:
             CrawlerQueueRecord(index=3, status="done", job=job1),
         ]
 
+    def test_data_serialization_roundtrip(self, tmp_path):
+        job1 = CrawlJob("A", group="A", data="simple-string")
+        job2 = CrawlJob("B", group="B", data={"nested": [1, 2, 3]})
+        job3 = CrawlJob("C", group="C")
+
+        queue = CrawlerQueue(tmp_path)
+        queue.put_many([job1, job2, job3])
+
+        del queue
+
+        queue = CrawlerQueue(tmp_path, resume=True)
+
+        jobs = consume(queue)
+
+        assert jobs == [job1, job2, job3]
+        assert [job.data for job in jobs] == [
+            "simple-string",
+            {"nested": [1, 2, 3]},
+            None,
+        ]
+
+        assert [record.job.data for record in queue.dump()] == [
+            "simple-string",
+            {"nested": [1, 2, 3]},
+            None,
+        ]
+
+    def test_legacy_database_format(self, tmp_path):
+        job = CrawlJob("A", group="A", data={"legacy": True})
+
+        queue = CrawlerQueue(tmp_path)
+        queue.put(job)
+        queue.close()
+
+        # Databases written by older versions of the queue hold untagged
+        # pickled data blobs and a "parallelism" table
+        connection = sqlite3.connect(join(tmp_path, "queue.db"))
+
+        with connection:
+            connection.execute(
+                'UPDATE "queue" SET "data" = ?;',
+                (pickle.dumps({"legacy": True}, protocol=pickle.HIGHEST_PROTOCOL),),
+            )
+            connection.execute(
+                'CREATE TABLE "parallelism" ("group" TEXT PRIMARY KEY, "count" INTEGER);'
+            )
+
+        connection.close()
+
+        queue = CrawlerQueue(tmp_path, resume=True)
+
+        resumed = queue.get_nowait()
+
+        assert resumed == job
+        assert resumed.data == {"legacy": True}
+
+        tables = queue.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table';"
+        ).fetchall()
+
+        assert ("parallelism",) not in tables
+
     def test_memory_leak(self):
         queue = CrawlerQueue()
 